@@ -6,8 +6,13 @@ from app.core.config import settings
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
+# Shared pool settings: a fixed-size pool with no health-check round-trip
+# per checkout. The workload reuses connections heavily, so keeping them
+# pooled (and skipping pre-ping) avoids paying connection setup on first use.
+POOL_KWARGS = dict(pool_size=10, max_overflow=0, pool_pre_ping=False)
+
 # Create the default engine and sessionmaker
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **POOL_KWARGS)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -22,7 +27,7 @@ def get_db():
 # --- New Functions Added ---
 def get_engine(database_url: str = SQLALCHEMY_DATABASE_URL):
     """Factory function to create a new SQLAlchemy engine."""
-    return create_engine(database_url)
+    return create_engine(database_url, **POOL_KWARGS)
 
 def get_sessionmaker(engine):
     """Factory function to create a new sessionmaker bound to the given engine."""
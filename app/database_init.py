@@ -4,14 +4,66 @@ Add this to your app/database_init.py or create a new one.
 """
 from sqlalchemy import text
 from app.database import Base, engine
+# Import the model modules so Base.metadata is populated even when this module
+# is used standalone (e.g. scripts/build_test_db_snapshot.sh); without them
+# create_all and schema_fingerprint() would see an empty metadata
+import app.models.user  # noqa: F401
+import app.models.calculation  # noqa: F401
+import hashlib
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Memoized metadata walk: repeated reset/truncate calls in a test session
+# reuse the same table list instead of re-sorting the dependency graph.
+# Resolved lazily so all model modules are imported before it's computed.
+_sorted_tables_cache = None
+_table_names_cache = None
+
+
+def _sorted_tables():
+    """Return Base.metadata.sorted_tables, computed once and cached."""
+    global _sorted_tables_cache, _table_names_cache
+    if _sorted_tables_cache is None:
+        _sorted_tables_cache = Base.metadata.sorted_tables
+        _table_names_cache = [t.name for t in reversed(_sorted_tables_cache)]
+    return _sorted_tables_cache
+
+
+def _table_names():
+    """Return the table names in reverse dependency (FK-safe) order."""
+    _sorted_tables()
+    return _table_names_cache
+
+
+def schema_fingerprint() -> str:
+    """
+    Return a stable hash of the model schema (table names, columns, types).
+    Used to detect when a pre-built schema snapshot no longer matches the
+    models and must be rebuilt.
+    """
+    spec = sorted(
+        (table.name, tuple(f"{col.name}:{col.type}" for col in table.columns))
+        for table in _sorted_tables()
+    )
+    return hashlib.sha256(repr(spec).encode()).hexdigest()
+
+
+def _warm_pool(count: int = 5):
+    """
+    Open and release a handful of connections so the pool is populated
+    up front and the first real query doesn't pay connection setup.
+    """
+    connections = [engine.connect() for _ in range(count)]
+    for conn in connections:
+        conn.close()
+    logger.info(f"Warmed connection pool with {count} connections.")
+
 
 def init_db():
     """Initialize the database by creating all tables."""
     Base.metadata.create_all(bind=engine)
+    _warm_pool()
     logger.info("Database tables created.")
 
 
@@ -21,36 +73,79 @@ def drop_db():
     This version uses CASCADE to handle dependencies.
     """
     try:
-        # Method 1: Use SQLAlchemy's built-in drop_all (handles dependencies)
-        Base.metadata.drop_all(bind=engine)
+        # Method 1: Use SQLAlchemy's built-in drop_all (handles dependencies).
+        # checkfirst=False skips the per-table existence probe - one fewer
+        # round-trip per table, and missing tables just route to the
+        # IF EXISTS fallback below
+        Base.metadata.drop_all(bind=engine, tables=_sorted_tables(), checkfirst=False)
         logger.info("Database tables dropped successfully using drop_all.")
     except Exception as e:
         logger.warning(f"drop_all failed: {e}. Trying CASCADE method...")
-        
+
         # Method 2: If drop_all fails, use raw SQL with CASCADE
         try:
+            # SQLAlchemy already knows the table list in-process; reversed
+            # dependency order respects FKs, so no pg_tables catalog query
+            # (and its round-trip) is needed
+            tables = _table_names()
+
             with engine.connect() as conn:
-                # Get all table names
-                result = conn.execute(text("""
-                    SELECT tablename FROM pg_tables 
-                    WHERE schemaname = 'public'
-                """))
-                tables = [row[0] for row in result]
-                
-                # Drop each table with CASCADE
-                for table in tables:
-                    conn.execute(text(f'DROP TABLE IF EXISTS "{table}" CASCADE'))
-                
-                conn.commit()
-                logger.info(f"Dropped {len(tables)} tables using CASCADE.")
+                if tables:
+                    # Drop all tables in a single statement - one round-trip
+                    # and one commit instead of one per table
+                    table_list = ','.join(f'"{table}"' for table in tables)
+                    try:
+                        conn.execute(text(f'DROP TABLE IF EXISTS {table_list} CASCADE'))
+                    except Exception as bulk_error:
+                        logger.warning(f"Bulk drop failed: {bulk_error}. Dropping tables one by one...")
+                        # The failed statement left the transaction aborted;
+                        # roll back so the per-table statements can run
+                        conn.rollback()
+                        # Method 3: Fall back to dropping each table individually
+                        for table in tables:
+                            conn.execute(text(f'DROP TABLE IF EXISTS "{table}" CASCADE'))
+
+                    conn.commit()
+                    logger.info(f"Dropped {len(tables)} tables using CASCADE.")
         except Exception as e2:
             logger.error(f"Failed to drop tables: {e2}")
             raise
 
 
+def truncate_db():
+    """
+    Empty all tables without dropping them.
+
+    TRUNCATE ... RESTART IDENTITY CASCADE clears every table and resets
+    sequences in one statement, which is far cheaper than the DDL churn of
+    drop_db()/init_db() when the schema itself has not changed (e.g. between
+    tests).
+    """
+    tables = _table_names()
+    if not tables:
+        return
+    table_list = ','.join(f'"{table}"' for table in tables)
+    with engine.connect() as conn:
+        conn.execute(text(f'TRUNCATE TABLE {table_list} RESTART IDENTITY CASCADE'))
+        conn.commit()
+    logger.info(f"Truncated {len(tables)} tables.")
+
+
 def reset_db():
-    """Complete database reset: drop all tables and recreate them."""
+    """
+    Complete database reset: drop all tables and recreate them.
+    Use truncate_db() instead when only the data needs clearing.
+    """
     logger.info("Resetting database...")
-    drop_db()
-    init_db()
+    try:
+        # One transaction around both phases: a single commit (and a single
+        # WAL fsync on Postgres) instead of separate implicit transactions
+        # for the drop and the create
+        with engine.begin() as conn:
+            Base.metadata.drop_all(bind=conn, tables=_sorted_tables(), checkfirst=False)
+            Base.metadata.create_all(bind=conn)
+    except Exception as e:
+        logger.warning(f"Single-transaction reset failed: {e}. Falling back to drop_db/init_db...")
+        drop_db()
+        init_db()
     logger.info("Database reset complete.")
\ No newline at end of file
@@ -20,13 +20,16 @@ from app.schemas.calculation import CalculationBase, CalculationResponse, Calcul
 from app.schemas.token import TokenResponse
 from app.schemas.user import UserCreate, UserResponse, UserLogin
 from app.database import Base, get_db, engine
+from app.database_init import init_db
 
 
 # Create tables on startup
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("Creating tables...")
-    Base.metadata.create_all(bind=engine)
+    # init_db also pre-warms this process's connection pool, so the first
+    # request doesn't pay connection establishment
+    init_db()
     print("Tables created successfully!")
     yield
 
@@ -0,0 +1,76 @@
+"""
+Shared helpers for the Playwright auth tests.
+
+Keeping the form-fill, submit, and registration patterns in one place means
+any speedup applied here (batched fills, response-based waits) applies to
+every test that drives the auth UI.
+"""
+from faker import Faker
+from playwright.sync_api import Page
+
+fake = Faker()
+
+
+def make_registration_data(**overrides) -> dict:
+    """
+    Build a complete registration payload with a unique username. The email
+    and confirm_password are derived once here instead of being re-formatted
+    in every test; pass overrides to break specific fields on purpose.
+    """
+    data = {
+        "username": f"testuser_{fake.random_int(min=10_000_000, max=99_999_999)}",
+        "first_name": fake.first_name(),
+        "last_name": fake.last_name(),
+        "password": "TestPass123!",
+    }
+    data.update(overrides)
+    data.setdefault("email", f"{data['username']}@example.com")
+    data.setdefault("confirm_password", data["password"])
+    return data
+
+
+def fill_form(page: Page, values: dict) -> None:
+    """
+    Fill several form fields in one JS call.
+    Each page.fill() is a separate round-trip to the browser; setting all the
+    values in a single evaluate keeps form setup to one round-trip. Keys are
+    element ids, values the text to enter.
+    """
+    page.evaluate(
+        """(values) => {
+            for (const [id, value] of Object.entries(values)) {
+                const el = document.getElementById(id);
+                el.value = value;
+                el.dispatchEvent(new Event('input', { bubbles: true }));
+            }
+        }""",
+        values,
+    )
+
+
+def submit_and_wait(page: Page, button_selector: str, endpoint: str):
+    """
+    Click a submit button and wait for its backing fetch() to complete.
+    Waiting on the HTTP response fires as soon as the request finishes,
+    instead of polling for the alert the JS renders afterwards - the alert
+    checks that follow can then use a tight timeout. Only for submits that
+    actually reach the backend (client-side validation failures never fetch).
+    """
+    with page.expect_response(
+        lambda r: endpoint in r.url and r.request.method == "POST"
+    ) as response_info:
+        page.click(button_selector)
+    return response_info.value
+
+
+def register_user_via_ui(page: Page, **overrides) -> dict:
+    """
+    Drive the registration form once: batched fill, submit, and wait for the
+    /auth/register response. The caller navigates to the register page first.
+    Asserts the registration succeeded and returns the submitted user data.
+    """
+    data = make_registration_data(**overrides)
+    fill_form(page, data)
+    response = submit_and_wait(page, 'button[type="submit"]:has-text("Register")', "/auth/register")
+    assert response.status == 201, f"Registration failed with status {response.status}"
+    return data
@@ -18,7 +18,7 @@ from playwright.sync_api import sync_playwright, Browser, Page
 from app.database import Base, get_engine, get_sessionmaker
 from app.models.user import User
 from app.core.config import settings
-from app.database_init import init_db, drop_db
+from app.database_init import init_db, drop_db, truncate_db, schema_fingerprint
 
 # ======================================================================================
 # Logging Configuration
@@ -33,7 +33,9 @@ logger = logging.getLogger(__name__)
 # Database Configuration
 # ======================================================================================
 fake = Faker()
-Faker.seed(12345)
+# Deterministic, but distinct per xdist worker: with a fixed shared seed every
+# worker would draw the same username sequence and collide on registration
+Faker.seed(f"12345-{os.environ.get('PYTEST_XDIST_WORKER', 'master')}")
 
 test_engine = get_engine(database_url=settings.DATABASE_URL)
 TestingSessionLocal = get_sessionmaker(engine=test_engine)
@@ -113,17 +115,51 @@ def get_project_root() -> Path:
     # Default to current directory's parent
     return current.parent
 
+# ======================================================================================
+# Schema Snapshot (built by scripts/build_test_db_snapshot.sh)
+# ======================================================================================
+SCHEMA_DUMP = Path(__file__).resolve().parent / "fixtures" / "schema.dump"
+
+def restore_schema_snapshot() -> bool:
+    """
+    Restore the pre-built schema dump with pg_restore instead of running
+    create_all. Returns False when the snapshot is missing, stale (its
+    recorded fingerprint no longer matches the models), or the restore
+    fails - callers then fall back to create_all.
+    """
+    hash_file = SCHEMA_DUMP.parent / "schema.dump.hash"
+    if not SCHEMA_DUMP.exists() or not hash_file.exists():
+        return False
+    if hash_file.read_text().strip() != schema_fingerprint():
+        logger.info("Schema snapshot is stale (models changed); falling back to create_all.")
+        return False
+    result = subprocess.run(
+        ["pg_restore", "--clean", "--if-exists", "--no-owner",
+         "-d", settings.DATABASE_URL, str(SCHEMA_DUMP)],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        logger.warning(f"pg_restore failed: {result.stderr}. Falling back to create_all.")
+        return False
+    logger.info("Restored schema from snapshot.")
+    return True
+
 # ======================================================================================
 # Database Fixtures
 # ======================================================================================
 @pytest.fixture(scope="session", autouse=True)
-def setup_test_database(request):
+def setup_test_database(request, tmp_path_factory, worker_id):
     """
     Set up the test database before the session starts, and tear it down after tests
     unless --preserve-db is provided.
+
+    Under pytest-xdist every worker shares the same database, so exactly one
+    worker performs the initial TRUNCATE (the rest wait for it) and nobody
+    drops the schema at teardown - another worker may still be mid-session.
     """
     logger.info("Setting up test database...")
-    
+
     def drop_all_tables_cascade():
         """Drop all tables using CASCADE to handle foreign keys."""
         try:
@@ -147,26 +183,75 @@ def setup_test_database(request):
             logger.error(f"Error dropping tables: {e}")
             raise
     
+    def initialize_database():
+        try:
+            # Ensure the schema exists - from the pre-built snapshot when one is
+            # available, otherwise via create_all - then TRUNCATE instead of
+            # dropping and recreating every table
+            if not restore_schema_snapshot():
+                Base.metadata.create_all(bind=test_engine)
+            truncate_db()
+            logger.info("Test database initialized.")
+        except Exception as e:
+            logger.warning(f"Truncate-based setup failed: {e}. Rebuilding schema from scratch...")
+            drop_all_tables_cascade()
+            Base.metadata.create_all(bind=test_engine)
+            logger.info("Test database rebuilt.")
+
+    if worker_id == "master":
+        # Single-process run: this is the only session, so set up and tear down
+        initialize_database()
+        yield
+        if not request.config.getoption("--preserve-db"):
+            logger.info("Dropping test database tables...")
+            try:
+                drop_all_tables_cascade()
+            except Exception as e:
+                logger.error(f"Error during cleanup: {e}")
+        return
+
+    # pytest-xdist run: coordinate through marker files in the shared temp
+    # directory. The first worker to claim the marker initializes the
+    # database; the others wait until it's done so a late-starting worker's
+    # TRUNCATE can't wipe data other workers are already using.
+    shared_tmp = tmp_path_factory.getbasetemp().parent
+    claim_marker = shared_tmp / "db_setup.claim"
+    done_marker = shared_tmp / "db_setup.done"
     try:
-        # First, drop all existing tables with CASCADE
-        drop_all_tables_cascade()
-        
-        # Now create all tables fresh
-        Base.metadata.create_all(bind=test_engine)
-        logger.info("Test database initialized.")
-    except Exception as e:
-        logger.error(f"Error setting up test database: {str(e)}")
-        raise
+        claim_marker.touch(exist_ok=False)
+        claimed = True
+    except FileExistsError:
+        claimed = False
 
-    yield  # Tests run after this
+    if claimed:
+        initialize_database()
+        done_marker.touch()
+    else:
+        deadline = time.time() + 60
+        while not done_marker.exists():
+            if time.time() >= deadline:
+                raise RuntimeError("Timed out waiting for another worker to initialize the test database")
+            time.sleep(0.1)
 
-    # Cleanup after all tests
-    if not request.config.getoption("--preserve-db"):
-        logger.info("Dropping test database tables...")
-        try:
-            drop_all_tables_cascade()
-        except Exception as e:
-            logger.error(f"Error during cleanup: {e}")
+    yield
+    # No teardown drop here: the schema is shared and other workers may
+    # still be running. Use reset_db()/drop_db() for explicit cleanup.
+
+@pytest.fixture
+def clean_db(setup_test_database, worker_id):
+    """
+    Give a test an empty database via TRUNCATE rather than a full
+    drop/recreate cycle. Opt in by listing this fixture; the schema from the
+    session-scoped setup is reused as-is.
+
+    Single-process runs only: under pytest-xdist the database is shared, so
+    truncating here would wipe other workers' live data (including the
+    session-scoped registered_user).
+    """
+    if worker_id != "master":
+        pytest.skip("clean_db truncates the shared database; run without xdist")
+    truncate_db()
+    yield
 
 # ======================================================================================
 # Test Data Fixtures
@@ -176,6 +261,26 @@ def fake_user_data() -> Dict[str, str]:
     """Provide fake user data."""
     return create_fake_user()
 
+@pytest.fixture(scope="session")
+def registered_user(fastapi_server: str) -> Dict[str, str]:
+    """
+    Register one user via the JSON API and share it across the session.
+    Login-focused tests use this instead of re-driving the registration UI
+    (form fill, submit, redirect) before every login.
+    """
+    user_data = {
+        "username": f"shared_{fake.random_int(min=10_000_000, max=99_999_999)}",
+        "first_name": "Shared",
+        "last_name": "User",
+        "password": "SharedPass123!",
+        "confirm_password": "SharedPass123!",
+    }
+    user_data["email"] = f"{user_data['username']}@example.com"
+    response = requests.post(f"{fastapi_server}auth/register", json=user_data)
+    response.raise_for_status()
+    logger.info(f"Registered shared test user: {user_data['username']}")
+    return user_data
+
 @pytest.fixture
 def test_user(db_session: Session) -> User:
     """
@@ -212,13 +317,19 @@ def find_available_port() -> int:
         return s.getsockname()[1]
 
 @pytest.fixture(scope="session")
-def fastapi_server():
+def fastapi_server(worker_id):
     """
     Start a FastAPI test server in a subprocess. If the chosen port (default: 8000)
     is already in use, find another available port. Wait until the server is up
     before yielding its base URL.
+
+    Under pytest-xdist each worker gets its own port (8000 + worker number) so
+    parallel sessions don't collide.
     """
     base_port = 8000
+    if worker_id != "master":
+        # worker_id is e.g. "gw0", "gw1", ...
+        base_port += int(worker_id.lstrip("gw")) + 1
     server_url = f'http://127.0.0.1:{base_port}/'
 
     # Check if port is free; if not, pick an available port
@@ -249,6 +360,22 @@ def fastapi_server():
         process.terminate()
         raise ServerStartupError(f"Failed to start test server on {health_url}")
 
+    # Warm up the server before any test hits it: first requests pay for
+    # lazy route setup, Jinja template compilation, and the SQLAlchemy
+    # connection pool. Prepaying here keeps it out of individual tests.
+    try:
+        requests.get(f"{server_url}login", timeout=10)
+        requests.get(f"{server_url}register", timeout=10)
+        # Bogus login (expected 401): performs a real user lookup, so it
+        # opens a pooled DB connection without creating any data
+        requests.post(
+            f"{server_url}auth/login",
+            json={"username": "warmup_user", "password": "warmup_password"},
+            timeout=10,
+        )
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"Server warm-up request failed: {e}")
+
     logger.info(f"Test server running on {server_url}.")
     yield server_url
 
@@ -265,12 +392,27 @@ def fastapi_server():
 # Playwright Fixtures for UI Testing
 # ======================================================================================
 @pytest.fixture(scope="session")
-def browser_context():
-    """Provide a Playwright browser context for UI tests (session-scoped)."""
+def browser():
+    """
+    Launch a single Chromium instance for the whole session. Browser startup
+    costs hundreds of milliseconds, so tests share the browser and isolate
+    themselves with cheap per-test contexts instead.
+    """
     with sync_playwright() as playwright:
         browser = playwright.chromium.launch(
             headless=True,
-            args=['--no-sandbox', '--disable-dev-shm-usage']
+            args=[
+                '--no-sandbox',
+                '--disable-dev-shm-usage',
+                '--disable-gpu',
+                # Keep JS timers firing at full speed so the pages' timed
+                # redirects aren't stretched by background throttling
+                '--disable-background-timer-throttling',
+                '--disable-renderer-backgrounding',
+                '--disable-features=TranslateUI,BlinkGenPropertyTrees',
+                # The tests only read text/forms; skip image decode entirely
+                '--blink-settings=imagesEnabled=false',
+            ]
         )
         logger.info("Playwright browser launched.")
         try:
@@ -280,21 +422,46 @@ def browser_context():
             browser.close()
 
 @pytest.fixture
-def page(browser_context: Browser):
+def context(browser: Browser):
     """
-    Provide a new browser page for each test, with a standard viewport.
-    Closes the page and context after each test.
+    Provide a fresh browser context per test: isolated cookies and storage
+    without paying a browser launch.
     """
-    context = browser_context.new_context(
+    context = browser.new_context(
         viewport={'width': 1920, 'height': 1080},
         ignore_https_errors=True
     )
+    try:
+        yield context
+    finally:
+        context.close()
+
+@pytest.fixture
+def page(context):
+    """Provide a new page in the test's own context."""
     page = context.new_page()
     logger.info("New browser page created.")
     try:
         yield page
     finally:
-        logger.info("Closing browser page and context.")
+        logger.info("Closing browser page.")
+        page.close()
+
+@pytest.fixture(scope="class")
+def shared_page(browser: Browser):
+    """
+    One context and page reused across a class of tests. Only for tests that
+    don't depend on cookies/localStorage state (negative paths, navigation
+    checks) - those skip the per-test context/page creation entirely.
+    """
+    context = browser.new_context(
+        viewport={'width': 1920, 'height': 1080},
+        ignore_https_errors=True
+    )
+    page = context.new_page()
+    try:
+        yield page
+    finally:
         page.close()
         context.close()
 